@@ -17,12 +17,18 @@ def main():
     print("🎯 MDN Format Demo")
     print("=" * 50)
     
-    # Check if sample files exist
+    # Check if sample files exist - one directory sweep instead of a
+    # stat syscall per candidate file
     sample_files = ['test_files/financial_sample.xlsx', 'test_files/budget_sample.xlsx']
     available_files = []
-    
+
+    existing = set()
+    if os.path.isdir('test_files'):
+        with os.scandir('test_files') as it:
+            existing = {entry.name for entry in it}
+
     for file in sample_files:
-        if os.path.exists(file):
+        if os.path.basename(file) in existing:
             available_files.append(file)
             print(f"✅ Found sample file: {file}")
         else:
@@ -56,13 +62,13 @@ def main():
     print("🏁 Demo completed!")
     print(f"{'='*60}")
     
-    # Show generated files
+    # Show generated files (scandir caches stat info, halving syscalls
+    # versus listdir + getsize)
     print("\n📁 Generated files:")
-    for file in os.listdir('test_files'):
-        if file.endswith('.mdn') or file.endswith('_roundtrip.xlsx'):
-            file_path = os.path.join('test_files', file)
-            size = os.path.getsize(file_path)
-            print(f"   test_files/{file} ({size:,} bytes)")
+    with os.scandir('test_files') as it:
+        for entry in it:
+            if entry.name.endswith(('.mdn', '_roundtrip.xlsx')):
+                print(f"   test_files/{entry.name} ({entry.stat().st_size:,} bytes)")
     
     print(f"\n💡 Try these commands for more control:")
     print(f"   python mdn_converter.py excel2mdn test_files/financial_sample.xlsx")
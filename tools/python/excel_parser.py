@@ -5,48 +5,101 @@ Converts Excel (.xlsx) files to MDN (Markdown Numbers) format.
 
 import openpyxl
 import yaml
+import json
 import csv
 import io
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Dict, List, Any, Tuple
 from utils import format_timestamp, column_index_to_letter
 
+# Use libyaml's C emitter when PyYAML was built with it - roughly an
+# order of magnitude faster than the pure-Python default
+try:
+    _YamlDumper = yaml.CSafeDumper
+except AttributeError:
+    _YamlDumper = yaml.SafeDumper
+
+# The optional context block never changes, so serialize it once at
+# import time instead of on every conversion
+_CONTEXT_YAML = yaml.dump(
+    {
+        'purpose': 'excel_to_mdn_conversion',
+        'keyMetrics': ['data_integrity', 'formula_preservation'],
+        'businessRules': [
+            'All formulas must be preserved',
+            'Data types maintained through formatting',
+            'Sheet structure preserved'
+        ]
+    },
+    Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
+
+# Fixed MDN section markers
+_HEADER_MARKER = '--- MDN:HEADER YAML'
+_SHEET_MARKER_PREFIX = '--- MDN:SHEET CSV name='
+_FORMULAS_MARKER = '--- MDN:FORMULAS JSON'
+_FORMAT_MARKER = '--- MDN:FORMAT JSON'
+_SECTION_END = '---'
+_END_MARKER = 'END DOCUMENT'
+
 
 class ExcelToMDNConverter:
     """Convert Excel workbooks to MDN format."""
     
     def __init__(self):
         self.workbook = None
-        self.mdn_content = []
-    
-    def convert_file(self, excel_file_path: str) -> str:
+        self.sheet_csv = {}
+        self.formulas = {}
+        self.formatting = {}
+        self._out = None
+
+    def convert_file(self, excel_file_path: str, out=None) -> str:
         """
         Convert Excel file to MDN format.
-        
+
         Args:
             excel_file_path: Path to the Excel file
-            
+            out: Optional text file object; when given, MDN content is
+                streamed to it instead of being accumulated in memory
+
         Returns:
-            MDN format content as string
+            MDN format content as string, or None when streaming to `out`
         """
         print(f"Converting {excel_file_path} to MDN format...")
+
+        # Everything is written to a stream; a StringIO stands in when
+        # the caller wants the content back as a string
+        buffer = io.StringIO() if out is None else None
+        self._out = buffer if out is None else out
         
-        # Load Excel workbook
-        self.workbook = openpyxl.load_workbook(excel_file_path, data_only=False)
-        
-        # Generate MDN content
+        # Load Excel workbook in read-only (streaming) mode - much faster
+        # and lighter than building the full in-memory cell model
+        self.workbook = openpyxl.load_workbook(excel_file_path, read_only=True,
+                                               data_only=False, keep_links=False)
+
+        # Scan every sheet once, collecting CSV data, formulas and
+        # formatting in a single traversal
+        self._scan_workbook(excel_file_path)
+
+        # Generate MDN content from the collected data
         self._generate_header(excel_file_path)
         self._generate_sheets()
         self._generate_formulas()
         self._generate_formatting()
         self._add_end_marker()
-        
-        # Join all sections
-        mdn_content = '\n'.join(self.mdn_content)
+
+        # Read-only workbooks keep the source file open until closed
+        self.workbook.close()
         
         print(f"✓ Successfully converted to MDN format")
         print(f"✓ Generated {len(self.workbook.sheetnames)} sheets")
-        
-        return mdn_content
+
+        return buffer.getvalue() if buffer is not None else None
+
+    def _emit(self, text: str):
+        """Emit one MDN section or marker line."""
+        self._out.write(text)
+        self._out.write('\n')
     
     def _generate_header(self, source_file: str):
         """Generate YAML header section."""
@@ -63,206 +116,215 @@ class ExcelToMDNConverter:
             'sheets': self.workbook.sheetnames
         }
         
-        # Add optional context section
-        context_data = {
-            'purpose': 'excel_to_mdn_conversion',
-            'keyMetrics': ['data_integrity', 'formula_preservation'],
-            'businessRules': [
-                'All formulas must be preserved',
-                'Data types maintained through formatting',
-                'Sheet structure preserved'
-            ]
-        }
-        
         # Generate header section
-        self.mdn_content.append('--- MDN:HEADER YAML')
-        self.mdn_content.append(yaml.dump(header_data, default_flow_style=False, sort_keys=False))
-        self.mdn_content.append('---')
-        
-        # Add context section
-        self.mdn_content.append('# optional context section')
-        self.mdn_content.append(yaml.dump(context_data, default_flow_style=False, sort_keys=False))
-        self.mdn_content.append('---')
+        self._emit(_HEADER_MARKER)
+        self._emit(yaml.dump(header_data, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False))
+        self._emit(_SECTION_END)
+
+        # Add optional context section (pre-serialized at import time)
+        self._emit('# optional context section')
+        self._emit(_CONTEXT_YAML)
+        self._emit(_SECTION_END)
         
         print(f"    ✓ Header generated with {len(self.workbook.sheetnames)} sheets")
     
+    def _scan_workbook(self, excel_file_path: str):
+        """Scan all sheets, collecting CSV data, formulas and formatting.
+
+        Sheets are independent, so multi-sheet workbooks are scanned in
+        parallel worker processes (each opening its own read-only view of
+        the file); single-sheet workbooks skip the pool startup cost.
+        """
+        print("  Scanning workbook...")
+
+        sheet_names = self.workbook.sheetnames
+
+        if len(sheet_names) > 1:
+            with ProcessPoolExecutor() as executor:
+                results = executor.map(_scan_sheet_file,
+                                       repeat(excel_file_path), sheet_names)
+                for sheet_name, result in zip(sheet_names, results):
+                    self._store_scan(sheet_name, result)
+                    print(f"    ✓ Sheet '{sheet_name}' scanned")
+        else:
+            for sheet_name in sheet_names:
+                print(f"    Processing sheet: {sheet_name}")
+                result = _scan_worksheet(self.workbook[sheet_name], sheet_name)
+                self._store_scan(sheet_name, result)
+                print(f"      ✓ Sheet '{sheet_name}' scanned")
+
+    def _store_scan(self, sheet_name: str, result):
+        """Merge one sheet's scan result into instance state."""
+        csv_data, formulas, formatting = result
+        self.sheet_csv[sheet_name] = csv_data
+        self.formulas.update(formulas)
+        self.formatting.update(formatting)
+
     def _generate_sheets(self):
-        """Generate CSV sheet sections."""
+        """Generate CSV sheet sections from the scanned data."""
         print("  Generating CSV sheet sections...")
-        
-        for sheet_name in self.workbook.sheetnames:
-            print(f"    Processing sheet: {sheet_name}")
-            sheet = self.workbook[sheet_name]
-            
-            # Convert sheet to CSV
-            csv_data = self._sheet_to_csv(sheet)
-            
-            # Add sheet section
-            self.mdn_content.append(f'--- MDN:SHEET CSV name={sheet_name}')
-            self.mdn_content.append(csv_data)
-            self.mdn_content.append('---')
-            
-            print(f"      ✓ Sheet '{sheet_name}' converted to CSV")
-    
-    def _sheet_to_csv(self, sheet) -> str:
-        """
-        Convert Excel sheet to CSV format.
-        
-        Args:
-            sheet: OpenPyXL worksheet object
-            
-        Returns:
-            CSV data as string
-        """
-        # Get the used range
-        max_row = sheet.max_row
-        max_col = sheet.max_column
-        
-        if max_row == 0 or max_col == 0:
-            return ""  # Empty sheet
-        
-        # Convert to CSV
-        csv_buffer = io.StringIO()
-        csv_writer = csv.writer(csv_buffer)
-        
-        for row in range(1, max_row + 1):
-            row_data = []
-            for col in range(1, max_col + 1):
-                cell = sheet.cell(row=row, column=col)
-                value = cell.value
-                
-                # Handle different data types
-                if value is None:
-                    row_data.append("")
-                elif isinstance(value, (int, float)):
-                    row_data.append(str(value))
-                else:
-                    row_data.append(str(value))
-            
-            csv_writer.writerow(row_data)
-        
-        return csv_buffer.getvalue().strip()
-    
+
+        for sheet_name, csv_data in self.sheet_csv.items():
+            self._emit(_SHEET_MARKER_PREFIX + sheet_name)
+            self._emit(csv_data)
+            self._emit(_SECTION_END)
+
     def _generate_formulas(self):
-        """Generate formulas JSON section."""
+        """Generate formulas JSON section from the scanned data."""
         print("  Generating formulas section...")
-        
-        formulas = {}
-        total_formulas = 0
-        
-        for sheet_name in self.workbook.sheetnames:
-            sheet = self.workbook[sheet_name]
-            
-            for row in range(1, sheet.max_row + 1):
-                for col in range(1, sheet.max_column + 1):
-                    cell = sheet.cell(row=row, column=col)
-                    
-                    if cell.value is not None and isinstance(cell.value, str) and cell.value.startswith('='):
-                        # This is a formula
-                        cell_ref = f"{column_index_to_letter(col)}{row}"
-                        formula_key = f"{sheet_name}!{cell_ref}"
-                        formulas[formula_key] = cell.value
-                        total_formulas += 1
-        
-        # Add formulas section
-        self.mdn_content.append('--- MDN:FORMULAS JSON')
-        self.mdn_content.append(yaml.dump(formulas, default_flow_style=False, sort_keys=False))
-        self.mdn_content.append('---')
-        
-        print(f"    ✓ Formulas section generated with {total_formulas} formulas")
-    
+
+        self._emit(_FORMULAS_MARKER)
+        self._emit(json.dumps(self.formulas, indent=2, ensure_ascii=False))
+        self._emit(_SECTION_END)
+
+        print(f"    ✓ Formulas section generated with {len(self.formulas)} formulas")
+
     def _generate_formatting(self):
-        """Generate formatting JSON section."""
+        """Generate formatting JSON section from the scanned data."""
         print("  Generating formatting section...")
-        
-        formatting = {}
-        total_formatting_rules = 0
-        
-        for sheet_name in self.workbook.sheetnames:
-            sheet = self.workbook[sheet_name]
-            
-            for row in range(1, sheet.max_row + 1):
-                for col in range(1, sheet.max_column + 1):
-                    cell = sheet.cell(row=row, column=col)
-                    cell_ref = f"{column_index_to_letter(col)}{row}"
-                    
-                    # Check for number format
-                    if cell.number_format and cell.number_format != 'General':
-                        format_key = f"{sheet_name}!{cell_ref}"
-                        if format_key not in formatting:
-                            formatting[format_key] = {}
-                        formatting[format_key]['numberFormat'] = cell.number_format
-                        total_formatting_rules += 1
-                    
-                    # Check for font properties
-                    if cell.font:
-                        format_key = f"{sheet_name}!{cell_ref}"
-                        if format_key not in formatting:
-                            formatting[format_key] = {}
-                        
-                        if cell.font.bold:
-                            formatting[format_key]['bold'] = True
-                            total_formatting_rules += 1
-                        
-                        if cell.font.italic:
-                            formatting[format_key]['italic'] = True
-                            total_formatting_rules += 1
-                        
-                        # Only include color if it's not the default theme color (theme=1 is typically black)
-                        if (cell.font.color and 
-                            hasattr(cell.font.color, 'theme') and 
-                            cell.font.color.theme != 1):
-                            formatting[format_key]['theme'] = cell.font.color.theme
-                            total_formatting_rules += 1
-                        
-                        # Handle RGB colors if present
-                        if (cell.font.color and 
-                            hasattr(cell.font.color, 'rgb') and 
-                            cell.font.color.rgb and
-                            hasattr(cell.font.color, 'type') and
-                            cell.font.color.type == 'rgb'):
-                            try:
-                                rgb = str(cell.font.color.rgb)
-                                if rgb.startswith('FF'):  # Remove alpha channel
-                                    rgb = rgb[2:]
-                                formatting[format_key]['color'] = f"#{rgb}"
-                                total_formatting_rules += 1
-                            except Exception:
-                                # Skip color if there's an issue
-                                pass
-        
-        # Add formatting section (only if there are formatting rules)
-        if formatting:
-            # Remove empty formatting objects
-            clean_formatting = {k: v for k, v in formatting.items() if v}
-            
-            if clean_formatting:
-                self.mdn_content.append('--- MDN:FORMAT JSON')
-                self.mdn_content.append(yaml.dump(clean_formatting, default_flow_style=False, sort_keys=False))
-                self.mdn_content.append('---')
-                print(f"    ✓ Formatting section generated with {len(clean_formatting)} rules")
-            else:
-                print("    ✓ No meaningful formatting rules found, skipping formatting section")
+
+        # The scan only records non-empty formatting entries
+        if self.formatting:
+            self._emit(_FORMAT_MARKER)
+            self._emit(json.dumps(self.formatting, indent=2, ensure_ascii=False))
+            self._emit(_SECTION_END)
+            print(f"    ✓ Formatting section generated with {len(self.formatting)} rules")
         else:
             print("    ✓ No formatting rules found, skipping formatting section")
     
     def _add_end_marker(self):
         """Add END DOCUMENT marker."""
-        self.mdn_content.append('END DOCUMENT')
+        self._emit(_END_MARKER)
+
 
+def _scan_sheet_file(excel_file_path: str, sheet_name: str):
+    """Worker: open a read-only view of the workbook and scan one sheet."""
+    workbook = openpyxl.load_workbook(excel_file_path, read_only=True,
+                                      data_only=False, keep_links=False)
+    try:
+        return _scan_worksheet(workbook[sheet_name], sheet_name)
+    finally:
+        workbook.close()
 
-def excel_to_mdn(excel_file_path: str) -> str:
+
+def _scan_worksheet(sheet, sheet_name: str):
+    """
+    Scan a single sheet in one traversal.
+
+    Visits each cell exactly once, collecting the CSV representation,
+    formulas and formatting for the sheet.
+
+    Args:
+        sheet: OpenPyXL worksheet object
+        sheet_name: Name of the sheet being scanned
+
+    Returns:
+        Tuple of (csv_data, formula pairs, formatting pairs)
+    """
+    csv_buffer = io.StringIO()
+    csv_writer = csv.writer(csv_buffer)
+    # Collected as (key, value) pairs in coordinate order; the dicts are
+    # built once at merge time instead of being probed per cell
+    formulas = []
+    formatting = []
+
+    # If the workbook's style table only holds the default entry, no
+    # cell can carry formatting - skip the inspection for the whole sheet
+    has_styles = len(getattr(sheet.parent, '_cell_styles', ())) > 1
+
+    # Column letters repeat on every row - build them once per sheet
+    # instead of recomputing the same strings for millions of cells.
+    # max_column can trigger a dimension scan, so query it only once.
+    max_col = sheet.max_column or 0
+    col_letters = [column_index_to_letter(i) for i in range(1, max_col + 1)]
+    prefix = f"{sheet_name}!"
+
+    for row_idx, row in enumerate(sheet.iter_rows(), 1):
+        row_data = []
+        for col_idx, cell in enumerate(row, 1):
+            value = cell.value
+            if col_idx > len(col_letters):
+                col_letters.append(column_index_to_letter(col_idx))
+            cell_ref = f"{col_letters[col_idx - 1]}{row_idx}"
+
+            # csv.writer stringifies values itself; only None needs
+            # mapping to an empty field
+            if value is None:
+                row_data.append("")
+            else:
+                row_data.append(value)
+                # openpyxl tags formula cells with data_type 'f' - a
+                # single char comparison instead of an isinstance
+                # plus startswith check on every non-formula cell
+                if cell.data_type == 'f':
+                    formulas.append((f"{prefix}{cell_ref}", value))
+
+            # Most cells carry the default style - skip the whole
+            # formatting inspection for them (empty gap cells have
+            # no style information at all)
+            if not has_styles or not getattr(cell, 'has_style', False):
+                continue
+
+            entry = {}
+
+            # Check for number format
+            if cell.number_format and cell.number_format != 'General':
+                entry['numberFormat'] = cell.number_format
+
+            # Check for font properties
+            font = cell.font
+            if font:
+                if font.bold:
+                    entry['bold'] = True
+
+                if font.italic:
+                    entry['italic'] = True
+
+                color = font.color
+
+                # Only include color if it's not the default theme color
+                # (theme=1 is typically black); non-theme colors report
+                # an unset placeholder for .theme, so check .type first
+                if (color and
+                    color.type == 'theme' and
+                    isinstance(color.theme, int) and
+                    color.theme != 1):
+                    entry['theme'] = color.theme
+
+                # Handle RGB colors if present
+                if (color and
+                    color.type == 'rgb' and
+                    color.rgb):
+                    try:
+                        rgb = str(color.rgb)
+                        if rgb.startswith('FF'):  # Remove alpha channel
+                            rgb = rgb[2:]
+                        entry['color'] = f"#{rgb}"
+                    except Exception:
+                        # Skip color if there's an issue
+                        pass
+
+            if entry:
+                formatting.append((f"{prefix}{cell_ref}", entry))
+
+        csv_writer.writerow(row_data)
+
+    return csv_buffer.getvalue().strip(), formulas, formatting
+
+
+def excel_to_mdn(excel_file_path: str, out=None) -> str:
     """
     Convenience function to convert Excel file to MDN format.
-    
+
     Args:
         excel_file_path: Path to the Excel file
-        
+        out: Optional text file object to stream the MDN content to
+
     Returns:
-        MDN format content as string
+        MDN format content as string, or None when streaming to `out`
     """
     converter = ExcelToMDNConverter()
-    return converter.convert_file(excel_file_path)
+    return converter.convert_file(excel_file_path, out=out)
 
 
 if __name__ == "__main__":
@@ -275,13 +337,12 @@ if __name__ == "__main__":
     
     excel_file = sys.argv[1]
     try:
-        mdn_content = excel_to_mdn(excel_file)
-        
-        # Save to file
+        # Stream straight into a buffered file instead of materializing
+        # the full document string first
         output_file = excel_file.replace('.xlsx', '.mdn')
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(mdn_content)
-        
+        with open(output_file, 'w', encoding='utf-8', buffering=65536) as f:
+            excel_to_mdn(excel_file, out=f)
+
         print(f"\nMDN file saved as: {output_file}")
         
     except Exception as e:
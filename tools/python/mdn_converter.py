@@ -16,26 +16,25 @@ class MDNConverter:
     def excel_to_mdn(excel_file_path: str, output_file_path: str = None) -> str:
         """
         Convert Excel file to MDN format.
-        
+
         Args:
             excel_file_path: Path to the Excel file
             output_file_path: Optional path to save MDN file (if None, returns content only)
-            
+
         Returns:
-            MDN format content as string
+            MDN format content as string, or None when saving to a file
         """
         print(f"🔄 Converting Excel to MDN: {excel_file_path}")
-        
-        # Convert Excel to MDN
-        mdn_content = excel_to_mdn(excel_file_path)
-        
-        # Save to file if output path provided
+
+        # Stream straight to the output file when a path is provided,
+        # avoiding an intermediate full-content string
         if output_file_path:
-            with open(output_file_path, 'w', encoding='utf-8') as f:
-                f.write(mdn_content)
+            with open(output_file_path, 'w', encoding='utf-8', buffering=65536) as f:
+                excel_to_mdn(excel_file_path, out=f)
             print(f"💾 MDN file saved as: {output_file_path}")
-        
-        return mdn_content
+            return None
+
+        return excel_to_mdn(excel_file_path)
     
     @staticmethod
     def mdn_to_excel(mdn_file_path: str, output_file_path: str) -> None:
@@ -97,27 +96,33 @@ class MDNConverter:
             True if round-trip was successful, False otherwise
         """
         import os
-        
+        from concurrent.futures import ThreadPoolExecutor
+
         print(f"🔄🔄🔄 Starting round-trip test: {excel_file_path}")
-        
-        # Step 1: Excel → MDN
+
+        # Step 1: Excel → MDN (converted once, reused in memory below)
         print("\n📤 Step 1: Converting Excel to MDN...")
         mdn_content = excel_to_mdn(excel_file_path)
-        
-        # Save intermediate MDN file
+
         base_name = os.path.splitext(os.path.basename(excel_file_path))[0]
         mdn_file_path = os.path.join(output_dir, f"{base_name}_intermediate.mdn")
-        
-        with open(mdn_file_path, 'w', encoding='utf-8') as f:
-            f.write(mdn_content)
-        
-        print(f"   💾 Intermediate MDN saved as: {mdn_file_path}")
-        
-        # Step 2: MDN → Excel
-        print("\n📥 Step 2: Converting MDN back to Excel...")
         output_excel_path = os.path.join(output_dir, f"{base_name}_roundtrip.xlsx")
-        mdn_to_excel(mdn_content, output_excel_path)
-        
+
+        def _write_intermediate():
+            # The intermediate MDN file is archival only - write it with a
+            # large buffer while the Excel conversion runs
+            with open(mdn_file_path, 'w', encoding='utf-8', buffering=65536) as f:
+                f.write(mdn_content)
+
+        # Step 2: MDN → Excel from memory, overlapping the intermediate
+        # file write (I/O) with the conversion (CPU)
+        print("\n📥 Step 2: Converting MDN back to Excel...")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            write_future = executor.submit(_write_intermediate)
+            mdn_to_excel(mdn_content, output_excel_path)
+            write_future.result()
+
+        print(f"   💾 Intermediate MDN saved as: {mdn_file_path}")
         print(f"   💾 Round-trip Excel saved as: {output_excel_path}")
         
         # Step 3: Validate MDN structure
@@ -14,6 +14,19 @@ from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
+# Patterns used inside per-line/per-entry validation loops, compiled
+# once at import time
+_NAME_RE = re.compile(r'name=([^,\s]+)')
+_VERSION_RE = re.compile(r'^\d+\.\d+(\.\d+)?$')
+_FORMULA_KEY_RE = re.compile(r'^[^!]+![A-Z]+\d+$')
+_MARKER_RE = re.compile(r'---\s+(MDN:[A-Z_ ]+?)(?:\s+name=\S+)?\s*$')
+
+# Use libyaml's C parser when PyYAML was built with it
+try:
+    _YamlLoader = yaml.CSafeLoader
+except AttributeError:
+    _YamlLoader = yaml.SafeLoader
+
 
 @dataclass
 class ValidationResult:
@@ -40,18 +53,26 @@ class MDNValidator:
     ]
     
     ALL_SECTIONS = REQUIRED_SECTIONS + OPTIONAL_SECTIONS
+    _SECTION_SET = frozenset(ALL_SECTIONS)
     
     def __init__(self):
         self.content = ""
         self.lines = []
         self.section_positions = {}
+        self.section_ranges = {}
         
     def validate_file(self, file_path: str) -> ValidationResult:
         """Validate an MDN file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.content = f.read()
-                self.lines = self.content.split('\n')
+            # Read as bytes and decode in one shot - skips the text
+            # layer's incremental decoding and universal-newline
+            # translation, which dominate read time on large files
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            self.content = raw.decode('utf-8')
+            if '\r' in self.content:
+                self.content = self.content.replace('\r\n', '\n')
+            self.lines = self.content.split('\n')
         except FileNotFoundError:
             return ValidationResult(False, [f"File not found: {file_path}"], [], [], [])
         except Exception as e:
@@ -134,24 +155,36 @@ class MDNValidator:
     
     def _find_sections(self):
         """Find positions of all sections in the file"""
+        # Every section maps to a list of line numbers - sheets appear
+        # once per sheet, the other sections once. The body ranges are
+        # recorded alongside so the per-section validators can slice
+        # their content instead of re-scanning for the closing '---'.
         self.section_positions = {}
-        
+        self.section_ranges = {}
+        open_section = None
+        open_start = 0
+
         for i, line in enumerate(self.lines):
-            line = line.strip()
-            for section in self.ALL_SECTIONS:
-                if line.startswith('--- ') and section in line:
-                    # For CSV sections, we need to handle the name parameter
-                    if section == 'MDN:SHEET CSV':
-                        # Find all CSV sections
-                        if 'MDN:SHEET CSV' not in self.section_positions:
-                            self.section_positions['MDN:SHEET CSV'] = []
-                        if isinstance(self.section_positions['MDN:SHEET CSV'], list):
-                            self.section_positions['MDN:SHEET CSV'].append(i)
-                        else:
-                            self.section_positions['MDN:SHEET CSV'] = [i]
-                    else:
-                        self.section_positions[section] = i
-                    break
+            # Cheap prefix filter - the marker regex only runs on the
+            # handful of lines that can actually be delimiters
+            if not line.startswith('---'):
+                continue
+            match = _MARKER_RE.match(line)
+            if match and match.group(1) in self._SECTION_SET:
+                # A new marker implicitly closes an unterminated section
+                if open_section is not None:
+                    self.section_ranges[open_section].append((open_start, i))
+                section = match.group(1)
+                self.section_positions.setdefault(section, []).append(i)
+                self.section_ranges.setdefault(section, [])
+                open_section = section
+                open_start = i + 1
+            elif line.rstrip() == '---' and open_section is not None:
+                self.section_ranges[open_section].append((open_start, i))
+                open_section = None
+
+        if open_section is not None:
+            self.section_ranges[open_section].append((open_start, len(self.lines)))
     
     def _validate_yaml_header(self) -> Tuple[List[str], List[str], List[str]]:
         """Validate YAML header section"""
@@ -162,22 +195,15 @@ class MDNValidator:
         if 'MDN:HEADER YAML' not in self.section_positions:
             return errors, warnings, sheet_names
         
-        start_pos = self.section_positions['MDN:HEADER YAML']
-        
-        # Find end of YAML section
-        yaml_content = []
-        for i in range(start_pos + 1, len(self.lines)):
-            line = self.lines[i].strip()
-            if line == '---':
-                break
-            yaml_content.append(line)
-        
-        if not yaml_content:
+        start, end = self.section_ranges['MDN:HEADER YAML'][0]
+        yaml_content = '\n'.join(self.lines[start:end])
+
+        if not yaml_content.strip():
             errors.append("YAML header section is empty")
             return errors, warnings, sheet_names
-        
+
         try:
-            yaml_data = yaml.safe_load('\n'.join(yaml_content))
+            yaml_data = yaml.load(yaml_content, Loader=_YamlLoader)
             
             # Check required fields
             required_fields = ['source', 'version', 'created', 'sheets']
@@ -201,7 +227,7 @@ class MDNValidator:
             # Validate version format
             if 'version' in yaml_data:
                 version = str(yaml_data['version'])
-                if not re.match(r'^\d+\.\d+(\.\d+)?$', version):
+                if not _VERSION_RE.match(version):
                     warnings.append("Version format should be semantic (e.g., 1.0.0)")
             
         except yaml.YAMLError as e:
@@ -217,30 +243,21 @@ class MDNValidator:
         if 'MDN:SHEET CSV' not in self.section_positions:
             return errors, warnings
         
-        csv_positions = self.section_positions['MDN:SHEET CSV']
-        if not isinstance(csv_positions, list):
-            csv_positions = [csv_positions]
-        
-        for start_pos in csv_positions:
+        for start_pos, (start, end) in zip(self.section_positions['MDN:SHEET CSV'],
+                                           self.section_ranges['MDN:SHEET CSV']):
             # Get the full line to extract sheet name
             section_line = self.lines[start_pos].strip()
-            
+
             # Extract sheet name
-            sheet_name_match = re.search(r'name=([^,\s]+)', section_line)
+            sheet_name_match = _NAME_RE.search(section_line)
             if not sheet_name_match:
                 errors.append(f"Missing sheet name in CSV section at line {start_pos + 1}")
                 continue
-            
+
             sheet_name = sheet_name_match.group(1)
-            
-            # Find end of CSV section
-            csv_content = []
-            for i in range(start_pos + 1, len(self.lines)):
-                line = self.lines[i].strip()
-                if line == '---':
-                    break
-                csv_content.append(line)
-            
+
+            csv_content = self.lines[start:end]
+
             if not csv_content:
                 errors.append(f"CSV section for sheet '{sheet_name}' is empty")
                 continue
@@ -249,14 +266,19 @@ class MDNValidator:
             if len(csv_content) < 2:
                 warnings.append(f"Sheet '{sheet_name}' has very few rows")
             
-            # Check for consistent column count
-            column_counts = []
+            # Check for consistent column count - str.count is a C-level
+            # scan (no split-list allocation) and the loop exits on the
+            # first mismatch instead of tallying every row
+            first_count = None
             for line in csv_content:
-                if line.strip():
-                    column_counts.append(len(line.split(',')))
-            
-            if len(set(column_counts)) > 1:
-                warnings.append(f"Sheet '{sheet_name}' has inconsistent column counts")
+                # Blank test without the per-line str.strip() allocation
+                if line and not line.isspace():
+                    count = line.count(',')
+                    if first_count is None:
+                        first_count = count
+                    elif count != first_count:
+                        warnings.append(f"Sheet '{sheet_name}' has inconsistent column counts")
+                        break
         
         return errors, warnings
     
@@ -268,22 +290,15 @@ class MDNValidator:
         if 'MDN:FORMULAS JSON' not in self.section_positions:
             return errors, warnings
         
-        start_pos = self.section_positions['MDN:FORMULAS JSON']
-        
-        # Find end of JSON section
-        json_content = []
-        for i in range(start_pos + 1, len(self.lines)):
-            line = self.lines[i].strip()
-            if line == '---':
-                break
-            json_content.append(line)
-        
-        if not json_content:
+        start, end = self.section_ranges['MDN:FORMULAS JSON'][0]
+        json_content = '\n'.join(self.lines[start:end])
+
+        if not json_content.strip():
             errors.append("Formulas section is empty")
             return errors, warnings
-        
+
         try:
-            formulas_data = json.loads('\n'.join(json_content))
+            formulas_data = json.loads(json_content)
             
             if not isinstance(formulas_data, dict):
                 errors.append("Formulas section must contain a JSON object")
@@ -300,7 +315,7 @@ class MDNValidator:
                     continue
                 
                 # Check cell reference format
-                if not re.match(r'^[^!]+![A-Z]+\d+$', cell_ref):
+                if not _FORMULA_KEY_RE.match(cell_ref):
                     warnings.append(f"Cell reference format may be invalid: {cell_ref}")
                 
                 # Check formula format
@@ -317,22 +332,15 @@ class MDNValidator:
         errors = []
         warnings = []
         
-        start_pos = self.section_positions['MDN:FORMAT JSON']
-        
-        # Find end of JSON section
-        json_content = []
-        for i in range(start_pos + 1, len(self.lines)):
-            line = self.lines[i].strip()
-            if line == '---':
-                break
-            json_content.append(line)
-        
-        if not json_content:
+        start, end = self.section_ranges['MDN:FORMAT JSON'][0]
+        json_content = '\n'.join(self.lines[start:end])
+
+        if not json_content.strip():
             errors.append("Format section is empty")
             return errors, warnings
-        
+
         try:
-            format_data = json.loads('\n'.join(json_content))
+            format_data = json.loads(json_content)
             
             if not isinstance(format_data, dict):
                 errors.append("Format section must contain a JSON object")
@@ -358,16 +366,9 @@ class MDNValidator:
         errors = []
         warnings = []
         
-        start_pos = self.section_positions['MDN:AI_PROMPT']
-        
-        # Find end of section
-        prompt_content = []
-        for i in range(start_pos + 1, len(self.lines)):
-            line = self.lines[i].strip()
-            if line == '---':
-                break
-            prompt_content.append(line)
-        
+        start, end = self.section_ranges['MDN:AI_PROMPT'][0]
+        prompt_content = self.lines[start:end]
+
         if not prompt_content:
             warnings.append("AI prompt section is empty")
         
@@ -394,17 +395,12 @@ class MDNValidator:
         # Filter to only include sections that are present
         present_sections = [s for s in expected_order if s in self.section_positions]
         
-        # Check if order is maintained
+        # Check if order is maintained (positions are recorded in file
+        # order, so each section's first occurrence is its list head)
         for i in range(len(present_sections) - 1):
-            current_pos = self.section_positions[present_sections[i]]
-            next_pos = self.section_positions[present_sections[i + 1]]
-            
-            # Handle CSV section being a list of positions
-            if present_sections[i] == 'MDN:SHEET CSV' and isinstance(current_pos, list):
-                current_pos = min(current_pos)  # Use the first CSV section position
-            if present_sections[i + 1] == 'MDN:SHEET CSV' and isinstance(next_pos, list):
-                next_pos = min(next_pos)  # Use the first CSV section position
-            
+            current_pos = self.section_positions[present_sections[i]][0]
+            next_pos = self.section_positions[present_sections[i + 1]][0]
+
             if current_pos > next_pos:
                 errors.append(f"Section order violation: {present_sections[i]} appears after {present_sections[i + 1]}")
         
@@ -2,10 +2,16 @@
 Utility functions for MDN format conversion.
 """
 
+import functools
 import re
+from datetime import datetime, timezone
 from typing import Dict, List, Tuple, Any
 
 
+# Formulas and format rules reuse the same anchor cells heavily, so
+# memoizing the parse pays off; invalid references raise and are never
+# cached, which is the semantics we want
+@functools.lru_cache(maxsize=8192)
 def parse_cell_reference(cell_ref: str) -> Tuple[str, int, int]:
     """
     Parse Excel cell reference (e.g., 'A1', 'B2') into column and row.
@@ -22,26 +28,30 @@ def parse_cell_reference(cell_ref: str) -> Tuple[str, int, int]:
         >>> parse_cell_reference('B2')
         ('B', 2, 2)
     """
-    # Extract column letters and row number
-    match = re.match(r'([A-Z]+)(\d+)', cell_ref)
-    if not match:
-        raise ValueError(f"Invalid cell reference: {cell_ref}")
-    
-    column_letters = match.group(1)
-    row_number = int(match.group(2))
-    
-    # Convert column letters to index (A=1, B=2, AA=27, etc.)
+    # Manual scan - cell references are 2-6 chars, short enough that
+    # the regex engine's setup and Match allocation cost more than the
+    # walk itself. The column index accumulates in the same pass
+    # (A=1, B=2, AA=27, etc.).
+    n = len(cell_ref)
+    i = 0
     column_index = 0
-    for i, letter in enumerate(column_letters):
-        column_index += (ord(letter) - ord('A') + 1) * (26 ** (len(column_letters) - i - 1))
-    
-    return column_letters, column_index, row_number
+    while i < n and 'A' <= cell_ref[i] <= 'Z':
+        column_index = column_index * 26 + (ord(cell_ref[i]) - 64)
+        i += 1
+
+    if i == 0 or i == n or not cell_ref[i:].isdigit():
+        raise ValueError(f"Invalid cell reference: {cell_ref}")
+
+    return cell_ref[:i], column_index, int(cell_ref[i:])
 
 
 def column_letter_to_index(column_letter: str) -> int:
     """
     Convert Excel column letter to column index.
-    
+
+    Letters up to 'XFD' (Excel's last column) resolve through a
+    precomputed table; longer inputs fall back to arithmetic.
+
     Args:
         column_letter: Column letter(s) like 'A', 'B', 'AA', etc.
         
@@ -54,15 +64,24 @@ def column_letter_to_index(column_letter: str) -> int:
         >>> column_letter_to_index('AA')
         27
     """
+    index = _LETTER_TO_IDX.get(column_letter)
+    if index is not None:
+        return index
+
+    # Horner-style accumulation - one multiply-add per letter instead
+    # of recomputing 26 ** position for each one
     result = 0
-    for i, letter in enumerate(column_letter):
-        result += (ord(letter) - ord('A') + 1) * (26 ** (len(column_letter) - i - 1))
+    for letter in column_letter:
+        result = result * 26 + (ord(letter) - 64)
     return result
 
 
 def column_index_to_letter(column_index: int) -> str:
     """
     Convert Excel column index to column letter.
+
+    Indices up to 16384 (column 'XFD', Excel's maximum) come from a
+    precomputed table - a single list index in the hot per-cell loops.
     
     Args:
         column_index: Column index (1-based)
@@ -78,70 +97,109 @@ def column_index_to_letter(column_index: int) -> str:
     """
     if column_index < 1:
         raise ValueError("Column index must be 1 or greater")
-    
+
+    try:
+        return _IDX_TO_LETTER[column_index]
+    except IndexError:
+        return _build_column_letter(column_index)
+
+
+def _build_column_letter(column_index: int) -> str:
+    """Arithmetic column-letter construction (table builder/fallback)."""
     result = ""
     while column_index > 0:
         column_index -= 1
         result = chr(ord('A') + (column_index % 26)) + result
         column_index //= 26
-    
     return result
 
 
-def parse_range_reference(range_ref: str) -> List[str]:
+# Excel's column space is bounded (last column XFD = 16384), so both
+# conversion directions are precomputed once at import time
+_IDX_TO_LETTER = [None] + [_build_column_letter(i) for i in range(1, 16385)]
+_LETTER_TO_IDX = {letter: i for i, letter in enumerate(_IDX_TO_LETTER) if letter}
+
+# Marker lines: section starts like '--- MDN:SHEET CSV name=Budget'
+# (the group captures the section type) and the END DOCUMENT marker
+# (group unset). Multiline so one finditer covers the whole content.
+_MARKER_RE = re.compile(r'^--- MDN:(\w+)|END DOCUMENT', re.MULTILINE)
+
+
+def iter_range_reference(range_ref: str, max_row: int = 1000):
     """
-    Parse Excel range reference into individual cell references.
-    
+    Iterate over the individual cell references of an Excel range.
+
+    Lazy counterpart of parse_range_reference - a column range like
+    'A:A' expands to max_row references per column, so consumers that
+    only iterate never pay for the full list.
+
     Args:
         range_ref: Excel range like 'A1:B3', 'A:A', 'A1,A3,A5'
-        
-    Returns:
-        List of individual cell references
-        
-    Example:
-        >>> parse_range_reference('A1:B3')
-        ['A1', 'A2', 'A3', 'B1', 'B2', 'B3']
-        >>> parse_range_reference('A:A')
-        ['A1', 'A2', 'A3', ...]  # All cells in column A
-        >>> parse_range_reference('A1,A3,A5')
-        ['A1', 'A3', 'A5']
+        max_row: Row count assumed for open-ended column ranges
+
+    Yields:
+        Individual cell references
     """
-    cells = []
-    
-    # Split by comma for non-contiguous ranges
-    parts = range_ref.split(',')
-    
+    # Split by comma for non-contiguous ranges; the common single-range
+    # case skips the split (and its list) entirely
+    if ',' in range_ref:
+        parts = range_ref.split(',')
+    else:
+        parts = (range_ref,)
+
     for part in parts:
         part = part.strip()
-        
+
         if ':' in part:
             # Contiguous range like 'A1:B3' or 'A:A'
             start, end = part.split(':')
-            
+
             if start.isalpha() and end.isalpha():
-                # Column range like 'A:A'
+                # Column range like 'A:A' - the true extent is unknown,
+                # so assume max_row rows per column
                 start_col = column_letter_to_index(start)
                 end_col = column_letter_to_index(end)
-                for col_idx in range(start_col, end_col + 1):
-                    col_letter = column_index_to_letter(col_idx)
-                    # Note: For column ranges, we'd need to know the max row
-                    # For now, we'll use a reasonable default
-                    for row in range(1, 1001):  # Assume max 1000 rows
-                        cells.append(f"{col_letter}{row}")
+                start_row, end_row = 1, max_row
             else:
                 # Cell range like 'A1:B3'
-                start_col, start_row = parse_cell_reference(start)[:2]
-                end_col, end_row = parse_cell_reference(end)[:2]
-                
-                for col_idx in range(start_col, end_col + 1):
-                    for row_idx in range(start_row, end_row + 1):
-                        col_letter = column_index_to_letter(col_idx)
-                        cells.append(f"{col_letter}{row_idx}")
+                start_col, start_row = parse_cell_reference(start)[1:]
+                end_col, end_row = parse_cell_reference(end)[1:]
+
+            # The row suffixes repeat for every column - stringify each
+            # row number once, then a plain concat per cell beats an
+            # f-string format call in the inner loop
+            rows_str = [str(r) for r in range(start_row, end_row + 1)]
+            for col_idx in range(start_col, end_col + 1):
+                col_letter = column_index_to_letter(col_idx)
+                for row_str in rows_str:
+                    yield col_letter + row_str
         else:
             # Single cell reference
-            cells.append(part)
-    
-    return cells
+            yield part
+
+
+def parse_range_reference(range_ref: str) -> List[str]:
+    """
+    Parse Excel range reference into individual cell references.
+
+    Thin eager wrapper around iter_range_reference - prefer the
+    generator when the references are only iterated once.
+
+    Args:
+        range_ref: Excel range like 'A1:B3', 'A:A', 'A1,A3,A5'
+
+    Returns:
+        List of individual cell references
+
+    Example:
+        >>> parse_range_reference('A1:B3')
+        ['A1', 'A2', 'A3', 'B1', 'B2', 'B3']
+        >>> parse_range_reference('A:A')
+        ['A1', 'A2', 'A3', ...]  # All cells in column A
+        >>> parse_range_reference('A1,A3,A5')
+        ['A1', 'A3', 'A5']
+    """
+    return list(iter_range_reference(range_ref))
 
 
 def validate_mdn_structure(content: str) -> Dict[str, Any]:
@@ -162,33 +220,36 @@ def validate_mdn_structure(content: str) -> Dict[str, Any]:
         ['header', 'sheet', 'formulas', 'format', 'end']
     """
     sections = []
-    required_sections = ['header', 'sheet', 'formulas']
-    optional_sections = ['format']
-    
+    has_end = False
+
+    # One finditer pass over the content collects the section list and
+    # the required-section flags together - no per-line Python loop and
+    # no list holding a copy of every line
+    for match in _MARKER_RE.finditer(content):
+        section_type = match.group(1)
+        if section_type is not None:
+            sections.append(section_type.lower())
+        else:
+            has_end = True
+
     # Check for required sections
-    if '--- MDN:HEADER YAML' not in content:
+    if 'header' not in sections:
         return {'valid': False, 'error': 'Missing required HEADER section'}
-    
-    if '--- MDN:SHEET CSV' not in content:
+
+    if 'sheet' not in sections:
         return {'valid': False, 'error': 'Missing required SHEET section'}
-    
-    if '--- MDN:FORMULAS JSON' not in content:
+
+    if 'formulas' not in sections:
         return {'valid': False, 'error': 'Missing required FORMULAS section'}
-    
-    if 'END DOCUMENT' not in content:
+
+    if not has_end:
         return {'valid': False, 'error': 'Missing required END DOCUMENT marker'}
-    
-    # Extract section information
-    lines = content.split('\n')
-    for i, line in enumerate(lines):
-        if line.startswith('--- MDN:'):
-            section_type = line.split(' ')[1].split(':')[1]
-            sections.append(section_type.lower())
-    
+
     return {
         'valid': True,
         'sections': sections,
-        'total_lines': len(lines)
+        # Equivalent to len(content.split('\n')) without the list
+        'total_lines': content.count('\n') + 1
     }
 
 
@@ -203,5 +264,8 @@ def format_timestamp() -> str:
         >>> format_timestamp()
         '2025-01-15T12:00:00Z'
     """
-    from datetime import datetime, timezone
-    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    # isoformat builds the string directly instead of going through the
+    # strftime format-string interpreter; the offset suffix it emits for
+    # UTC ('+00:00') is rewritten to the spec's 'Z'
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    return now.isoformat().replace('+00:00', 'Z')
@@ -0,0 +1,144 @@
+"""
+Minimal streaming XLSX writer.
+
+Emits worksheet XML row-by-row straight into the output zip, bypassing
+openpyxl's Python-level XML serialization for the write-heavy path.
+Supports values and formulas with inline strings; cell formatting is
+out of scope (callers fall back to openpyxl when formats are present).
+"""
+
+import zipfile
+from xml.sax.saxutils import escape
+from utils import column_index_to_letter
+
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_RELS = _XML_DECL + (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>')
+
+# A bare-minimum style sheet so consumers that expect styles.xml
+# (Excel included) open the file without complaint
+_STYLES = _XML_DECL + (
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+    '<cellXfs count="1"><xf/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>')
+
+_SHEET_OPEN = _XML_DECL + (
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>')
+_SHEET_CLOSE = '</sheetData></worksheet>'
+
+
+class StreamingXlsxWriter:
+    """Write an XLSX file sheet-by-sheet without an in-memory workbook."""
+
+    def __init__(self, output_file_path: str):
+        self._zip = zipfile.ZipFile(output_file_path, 'w', zipfile.ZIP_DEFLATED)
+        self._sheet_names = []
+        # Shared-string table: repeated cell text is stored once and
+        # referenced by index, like Excel's own writer does
+        self._sst = {}
+        self._sst_refs = 0
+
+    def write_sheet(self, sheet_name: str, rows):
+        """Stream one sheet's rows (iterable of value lists) to the zip.
+
+        Cell values: None/'' are skipped (sparse), int/float become
+        numeric cells, strings starting with '=' become formulas and
+        everything else goes through the shared-string table.
+        """
+        self._sheet_names.append(sheet_name)
+        sheet_path = f'xl/worksheets/sheet{len(self._sheet_names)}.xml'
+        sst = self._sst
+
+        with self._zip.open(sheet_path, 'w') as f:
+            f.write(_SHEET_OPEN.encode('utf-8'))
+            for row_idx, row in enumerate(rows, 1):
+                cells = []
+                for col_idx, value in enumerate(row, 1):
+                    if value is None or value == '':
+                        continue
+                    ref = f'{column_index_to_letter(col_idx)}{row_idx}'
+                    if isinstance(value, (int, float)):
+                        cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+                    elif value.startswith('='):
+                        cells.append(f'<c r="{ref}"><f>{escape(value[1:])}</f></c>')
+                    else:
+                        self._sst_refs += 1
+                        idx = sst.setdefault(value, len(sst))
+                        cells.append(f'<c r="{ref}" t="s"><v>{idx}</v></c>')
+                f.write(f'<row r="{row_idx}">{"".join(cells)}</row>'.encode('utf-8'))
+            f.write(_SHEET_CLOSE.encode('utf-8'))
+
+    def close(self):
+        """Write the workbook metadata parts and close the zip."""
+        sheet_count = len(self._sheet_names)
+
+        overrides = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, sheet_count + 1))
+        content_types = _XML_DECL + (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            f'{overrides}</Types>')
+
+        sheets = ''.join(
+            f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, name in enumerate(self._sheet_names, 1))
+        workbook = _XML_DECL + (
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets>{sheets}</sheets></workbook>')
+
+        relationships = ''.join(
+            f'<Relationship Id="rId{i}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, sheet_count + 1))
+        workbook_rels = _XML_DECL + (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{relationships}'
+            f'<Relationship Id="rId{sheet_count + 1}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+            'Target="styles.xml"/>'
+            f'<Relationship Id="rId{sheet_count + 2}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+            'Target="sharedStrings.xml"/>'
+            '</Relationships>')
+
+        # Dict order is insertion order, which matches the indices the
+        # cells were written with
+        entries = ''.join(
+            f'<si><t xml:space="preserve">{escape(text)}</t></si>'
+            if text != text.strip() else f'<si><t>{escape(text)}</t></si>'
+            for text in self._sst)
+        shared_strings = _XML_DECL + (
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            f'count="{self._sst_refs}" uniqueCount="{len(self._sst)}">{entries}</sst>')
+
+        self._zip.writestr('[Content_Types].xml', content_types)
+        self._zip.writestr('_rels/.rels', _RELS)
+        self._zip.writestr('xl/workbook.xml', workbook)
+        self._zip.writestr('xl/_rels/workbook.xml.rels', workbook_rels)
+        self._zip.writestr('xl/styles.xml', _STYLES)
+        self._zip.writestr('xl/sharedStrings.xml', shared_strings)
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()